@@ -24,48 +24,45 @@
 #
 
 from collections import defaultdict
-import builtins
 import random
+import statistics
 import time
-from typing import Final, Any, Protocol, runtime_checkable, Generic, TypeVar
+from typing import Final, Any, Optional, Protocol, Generic, TypeVar
 
 from src.collections.trim_list.trim_list import TrimList
 from src.collections.chunk_list.chunk_list import ChunkList
+from src.collections.array_trim_list.array_trim_list import ArrayTrimList
 
 _T = TypeVar("_T")
 
-@runtime_checkable
 class TrimmableList(Protocol, Generic[_T]):
     def append(self, value: _T) -> int: ...
     def trim_before(self, idx: int) -> Any: ...
     def indexrange(self) -> range: ...
+    def get(self, idx: int) -> _T: ...
     def __getitem__(self, idx: int) -> _T: ...
     def __len__(self) -> int: ...
 
 
 class ChunkListAdapter(TrimmableList):
     _impl: ChunkList[int]
-    _trimmed: int
 
-    def __init__(self) -> None:
-        self._impl = ChunkList[int]()
-        self._trimmed = 0
+    def __init__(self, typecode: Optional[str] = None) -> None:
+        self._impl = ChunkList[int](typecode)
 
     def append(self, value: _T) -> int:
         self._impl.append(value)
 
     def trim_before(self, idx: int) -> Any:
-        ### TODO Not yet implemented in ChunkList
-        ###      Use dummy code here
-        self._trimmed = max(self._trimmed, idx)
+        self._impl.trim_before(idx)
     
     def indexrange(self) -> range:
-        kr = self._impl.keyrange()
-        return range(self._trimmed, kr.stop)
+        return self._impl.keyrange()
     
+    def get(self, idx: int) -> _T:
+        return self._impl.get(idx)
+
     def __getitem__(self, idx: int) -> _T:
-        if idx < self._trimmed:
-            return None
         return self._impl.get(idx)
     
     def __len__(self) -> int:
@@ -102,12 +99,20 @@ class TrimmableListBenchmarkBase:
 
     def _init_test_data(self) -> None:
         def test_data_func(idx: int) -> int:
-            return builtins.hash((idx,))
+            ### Knuth multiplicative hashing, without allocating a tuple.
+            return (idx * 2654435761) & 0xFFFFFFFF
         items_to_add = self.test_block_size * self.blocks_to_add
         self.test_data = [test_data_func(idx) for idx in range(items_to_add)]
     
+    @staticmethod
+    def _check_test_subject(test_subject: TrimmableList) -> None:
+        ### A plain hasattr() sanity check, done once per test subject,
+        ### in place of a runtime-checkable Protocol isinstance() check.
+        for name in ("append", "trim_before", "indexrange", "get", "__getitem__", "__len__"):
+            assert hasattr(test_subject, name), f"Test subject lacks {name}()"
+
     def randomized_populate(self, test_subject: TrimmableList) -> None:
-        assert isinstance(test_subject, TrimmableList)
+        self._check_test_subject(test_subject)
         assert len(test_subject) == 0
         _initial_indexrange = test_subject.indexrange()
         assert _initial_indexrange.start == 0
@@ -119,6 +124,8 @@ class TrimmableListBenchmarkBase:
         items_to_add = test_block_size * self.blocks_to_add
         items_to_remove = test_block_size * self.blocks_to_remove
         test_data = self.test_data
+        append_fn = test_subject.append
+        trim_before_fn = test_subject.trim_before
         added_count = 0
         removed_count = 0
         can_add = (added_count < items_to_add)
@@ -128,13 +135,13 @@ class TrimmableListBenchmarkBase:
             has_changed = False
             if can_add and (random_fn() < pa):
                 has_changed = True
-                test_subject.append(test_data[added_count])
+                append_fn(test_data[added_count])
                 added_count += 1
                 can_add = (added_count < items_to_add)
             if can_remove and (removed_count < added_count) and (random_fn() < pr):
                 has_changed = True
                 removed_count += 1
-                test_subject.trim_before(removed_count)
+                trim_before_fn(removed_count)
                 can_remove = (removed_count < items_to_remove)
             ### for occasional progress printing
             if has_changed:
@@ -147,47 +154,74 @@ class TrimmableListBenchmarkBase:
         expect_items_removed = self.test_block_size * self.blocks_to_remove
         # expect_items_remain = expect_items_added - expect_items_removed
         test_data = self.test_data
-        assert isinstance(test_subject, TrimmableList)
         assert len(test_subject) == expect_items_added
         _initial_indexrange = test_subject.indexrange()
         assert _initial_indexrange.start == expect_items_removed
         assert _initial_indexrange.stop == expect_items_added
+        get_fn = test_subject.get
         for idx in range(expect_items_removed, expect_items_added):
             expected_value = test_data[idx]
-            actual_value = test_subject[idx]
+            actual_value = get_fn(idx)
             assert actual_value == expected_value
 
     def block_random_read(self, test_subject: TrimmableList) -> None:
         BN = self.test_block_size
         BA = self.blocks_to_add
         BR = self.blocks_to_remove
-        assert isinstance(test_subject, TrimmableList)
         assert len(test_subject) == (BA * BN)
         _initial_indexrange = test_subject.indexrange()
         assert _initial_indexrange.start == (BR * BN)
         assert _initial_indexrange.stop == (BA * BN)
         timer_fn = time.perf_counter_ns
+        get_fn = test_subject.get
         round_count = (BA - BR) * 25
         raad_count_per_round = BN * 4
-        round_target_list: list[int] = [0] * round_count
         round_timing_list: list[int] = [0] * round_count
         round_dummy_list: list[int] = [0] * round_count
+        ### All rounds' inputs are generated up front, so that no input
+        ### construction runs between timed rounds. Each read index list
+        ### refers to one shared int object per item index.
+        block_idx_lists: list[list[int]] = [
+            list(range(block * BN, (block + 1) * BN))
+            for block in range(BA)
+        ]
+        round_target_list: list[int] = random.choices(range(BR, BA), k=round_count)
+        round_read_idx_lists: list[list[int]] = [
+            random.choices(block_idx_lists[target_block], k=raad_count_per_round)
+            for target_block in round_target_list
+        ]
+        ### Calibrate the cost of one timer call. Each timed round includes
+        ### about one call's worth (the end of the first call and the start
+        ### of the second), which is subtracted in the summary below.
+        ### Each batch subtracts the cost of an empty loop of the same length,
+        ### and the median over several batches is used.
+        calibration_batch_count = 9
+        calibration_range = range(10000)
+        calibration_list: list[float] = []
+        for _ in range(calibration_batch_count):
+            loop_start = timer_fn()
+            for _ in calibration_range:
+                pass
+            loop_stop = timer_fn()
+            calls_start = timer_fn()
+            for _ in calibration_range:
+                timer_fn()
+            calls_stop = timer_fn()
+            loop_ns = loop_stop - loop_start
+            calls_ns = calls_stop - calls_start
+            calibration_list.append((calls_ns - loop_ns) / len(calibration_range))
+        timer_overhead_ns = max(0.0, statistics.median(calibration_list))
+        print(f"Timer overhead = {timer_overhead_ns:.2f} ns per call")
         for round_idx in range(round_count):
-            target_block = random.randint(BR, BA - 1)
-            assert BR <= target_block < BA
+            target_block = round_target_list[round_idx]
             if (round_idx % 100) == 0:
                 print(f"Randomized block test, round = {round_idx}, target_block = {target_block}")
-            round_target_list[round_idx] = target_block
-            read_range_start = target_block * BN
-            read_range_stop = read_range_start + BN
-            read_idx_list = [
-                random.randint(read_range_start, read_range_stop - 1)
-                for _ in range(raad_count_per_round)
-            ]
-            dummy_sum = 0
+            read_idx_list = round_read_idx_lists[round_idx]
+            ### The read loop is driven from C by sum() and map(), so that
+            ### the timing reflects the test subject and not the interpreter
+            ### dispatch of a Python-level for-loop.
             time_start = timer_fn()
-            for idx in read_idx_list:
-                dummy_sum += test_subject[idx]
+            dummy_sum = sum(map(get_fn, read_idx_list))
             time_stop = timer_fn()
             assert time_start < time_stop 
             round_timing_list[round_idx] = time_stop - time_start
@@ -195,8 +229,10 @@ class TrimmableListBenchmarkBase:
         block_timing_summary = [0] * BA
         block_opcount_summary = [0] * BA
         block_dummy_summary = [0] * BA
+        block_round_summary = [0] * BA
         for round_idx in range(round_count):
             target_block = round_target_list[round_idx]
+            block_round_summary[target_block] += 1
             block_timing_summary[target_block] += round_timing_list[round_idx]
             block_opcount_summary[target_block] += raad_count_per_round
             block_dummy_summary[target_block] += round_dummy_list[round_idx]
@@ -205,17 +241,20 @@ class TrimmableListBenchmarkBase:
             read_range_stop = read_range_start + BN
             total_ns = block_timing_summary[target_block]
             total_ops = block_opcount_summary[target_block]
+            overhead_ns = timer_overhead_ns * block_round_summary[target_block]
             dummy_str = str(block_dummy_summary[target_block])
             dummy_str = dummy_str[:3] + "..." + dummy_str[-3:]
-            ns_per_ops = total_ns / total_ops
+            ns_per_ops = (total_ns - overhead_ns) / total_ops
             text = [
                 f"Block [{target_block}], ",
                 f"item index range ({read_range_start}, {read_range_stop}), ",
                 f"avg_ns_per_read={ns_per_ops:.2f} = ",
-                f"({total_ns} ns / {total_ops} ops), ",
+                f"(({total_ns} - {overhead_ns:.0f}) ns / {total_ops} ops), ",
                 f"dummy = {dummy_str}"
             ]
             print("".join(text))
+            if overhead_ns > 0.1 * total_ns:
+                print(f"Warning: timer overhead exceeds 10% of the measured time for block [{target_block}].")
 
 
 if __name__ == "__main__":
@@ -241,6 +280,8 @@ if __name__ == "__main__":
     test_subject_list = [
         ("TrimList", lambda: TrimList[int]()),
         ("ChunkList", lambda: ChunkListAdapter()),
+        ("ChunkList[q]", lambda: ChunkListAdapter("q")),
+        ("ArrayTrimList", lambda: ArrayTrimList()),
     ]
 
     for test_subject_name, test_subject_factory in test_subject_list:
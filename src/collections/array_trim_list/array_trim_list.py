@@ -0,0 +1,71 @@
+# Copyright 2024 Kin-Chung (Ryan) Wong
+# All rights reserved.
+#
+# THIS IS NOT FREE SOFTWARE. You may not use this file except with written permission
+# from the original author(s).
+#
+# THE SOFTWARE SOURCE CODE IS MADE AVAILABLE FOR PUBLIC VIEWING “AS IS”, WITHOUT
+# WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER 
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF 
+# OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+from array import array
+from typing import Final, Optional
+
+
+class ArrayTrimList:
+    """A trimmable list of int64 values, backed by a flat array.
+
+    Trimming advances a head cursor instead of popping items; the trimmed
+    prefix is compacted away once it exceeds half of the backing array.
+    """
+    _data: Final[array]
+    _base: int
+    _head: int
+
+    def __init__(self) -> None:
+        self._data = array("q")
+        self._base = 0
+        self._head = 0
+
+    def __len__(self) -> int:
+        return self._base + len(self._data)
+
+    def indexrange(self) -> range:
+        return range(self._base + self._head, self._base + len(self._data))
+
+    def get(self, idx: int) -> int:
+        offset = idx - self._base
+        if offset < self._head:
+            raise IndexError(f"{self.__class__.__qualname__} index {idx} has been trimmed.")
+        return self._data[offset]
+
+    __getitem__ = get
+
+    def append(self, value: int) -> int:
+        self._data.append(value)
+        return self._base + len(self._data) - 1
+
+    def pop_left(self) -> Optional[int]:
+        if self._head == len(self._data):
+            return None
+        value = self._data[self._head]
+        self._advance_head(self._head + 1)
+        return value
+
+    def trim_before(self, idx: int) -> list[int]:
+        head = self._head
+        new_head = min(max(head, idx - self._base), len(self._data))
+        trimmed_values = self._data[head:new_head].tolist()
+        self._advance_head(new_head)
+        return trimmed_values
+
+    def _advance_head(self, new_head: int) -> None:
+        if new_head * 2 > len(self._data):
+            del self._data[:new_head]
+            self._base += new_head
+            new_head = 0
+        self._head = new_head
@@ -12,25 +12,35 @@
 # OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 
+from array import array
 from collections.abc import Iterable
-from functools import lru_cache
-from typing import TypeVar, Generic, Union, Final, Any, Optional
+from typing import TypeVar, Generic, Union, Final, Optional
 
 _T = TypeVar("_T")
 
 class ChunkList(Generic[_T]):
-    _BITS = 7
-    _MASK = 127
+    __slots__ = ("_data", "_segment", "_base", "_start", "_stop")
     _CHUNKSIZE = 128
-    _LEVELS = 3
-    _data: Final[list[list[list[_T]]]]
-    _pool: Final[list[list[Any]]]
+    _data: Final[Union[list[Optional[_T]], array]]
+    _segment: Final[Union[list[None], array]]
+    _base: int
     _start: int
     _stop: int
 
-    def __init__(self) -> None:
-        self._data = self._pool_getnew()
-        self._pool = []
+    def __init__(self, typecode: Optional[str] = None) -> None:
+        """Creates an empty ChunkList.
+
+        Arguments:
+            typecode: If given, items are stored unboxed in an array.array
+                of this typecode (e.g. "q" for int64) instead of a list.
+        """
+        if typecode is None:
+            self._data = []
+            self._segment = [None] * self._CHUNKSIZE
+        else:
+            self._data = array(typecode)
+            self._segment = array(typecode, bytes(self._data.itemsize * self._CHUNKSIZE))
+        self._base = 0
         self._start = 0
         self._stop = 0
 
@@ -43,29 +53,46 @@ class ChunkList(Generic[_T]):
             and each item thereafter will be assigned the next index.
             The returned index value does not wraparound.
         """
-        (idx, self._stop) = (self._stop, self._stop + 1)
-        self.put(idx, item)
+        data = self._data
+        idx = self._stop
+        offset = idx - self._base
+        if offset == len(data):
+            ### Grow geometrically by about 1.5x, in whole segments.
+            data.extend(self._segment * max(1, len(data) // (2 * self._CHUNKSIZE)))
+        data[offset] = item
+        self._stop = idx + 1
         return idx
 
     def put(self, idx: int, item: Optional[_T]) -> None:
-        _, k1, k2, k3 = self._decompose(idx)
-        ### TODO optimize later
-        if self._data[k1] is None:
-            self._data[k1] = self._pool_get()
-        if self._data[k1][k2] is None:
-            self._data[k1][k2] = self._pool_get()
-        self._data[k1][k2][k3] = item
+        if not (self._start <= idx < self._stop):
+            raise IndexError(f"{self.__class__.__qualname__}.put() index {idx} out of range.")
+        self._data[idx - self._base] = item
 
     def get(self, idx: int) -> Optional[_T]:
         if not (self._start <= idx < self._stop):
             return None
-        _, k1, k2, k3 = self._decompose(idx)
-        if self._data[k1] is None:
-            return None
-        if self._data[k1][k2] is None:
-            return None
-        return self._data[k1][k2][k3]
+        return self._data[idx - self._base]
     
+    def trim_before(self, idx: int) -> None:
+        """Discards all items with index less than idx.
+
+        Post-conditions:
+            get() returns None for discarded indices, and keyrange()
+            starts at idx, clamped to the current stop index.
+
+        Storage is reclaimed in whole segments, with one slice deletion,
+        once the discarded prefix reaches half of the storage.
+        """
+        start = max(self._start, min(idx, self._stop))
+        self._start = start
+        data = self._data
+        chunksize = self._CHUNKSIZE
+        dead_count = start - self._base
+        if dead_count >= chunksize and dead_count * 2 >= len(data):
+            dead_count -= dead_count % chunksize
+            del data[:dead_count]
+            self._base += dead_count
+
     def keyrange(self) -> range:
         return range(self._start, self._stop)
 
@@ -83,56 +110,27 @@ class ChunkList(Generic[_T]):
                 stop = self._stop
             elif stop < 0:
                 stop += self._stop
-            start = max(start, self._start)
-            stop = min(stop, self._stop) 
-            if not (start < stop):
-                return
-            for idx in range(start, stop):
-                yield (idx, self.get(idx))
-            return
+            ### Walk the storage one segment at a time, zipping the indices
+            ### with a slice of the segment, so that no method call is made
+            ### per item. The bounds are re-read for every segment, so that
+            ### trims and puts made during iteration are seen from the next
+            ### segment on.
+            chunksize = self._CHUNKSIZE
+            idx = start
+            while True:
+                idx = max(idx, self._start)
+                end = min(stop, self._stop, (idx // chunksize + 1) * chunksize)
+                if not (idx < end):
+                    return
+                base = self._base
+                yield from zip(range(idx, end), self._data[idx - base:end - base])
+                idx = end
         if isinstance(_slice, slice):
             _slice = range(_slice.start, _slice.stop, _slice.step)
         if isinstance(_slice, Iterable):
+            get = self.get
             for idx in _slice:
                 if (self._start <= idx < self._stop):
-                    yield (idx, self.get(idx))
+                    yield (idx, get(idx))
         else:
             raise Exception(f"{self.__class__.__qualname__}.enumerate() cannot interpret {repr(_slice)} as slice.")
-
-    def _decompose(self, idx: int) -> tuple[int, int, int, int]:
-        bits = self._BITS
-        mask = self._MASK
-        idx3 = idx & mask
-        idx >>= bits
-        idx2 = idx & mask
-        idx >>= bits
-        idx1 = idx & mask
-        idx >>= bits
-        return (idx, idx1, idx2, idx3)
-
-    def _compose(self, key: tuple[int, int, int, int]) -> int:
-        assert type(key) == tuple
-        assert len(key) == 4
-        c = self._CHUNKSIZE
-        return ((key[0] * c + key[1]) * c + key[2]) * c + key[3]
-
-    def _pool_get(self) -> list[Any]:
-        if self._pool is not None and len(self._pool) > 0:
-            obj = self._pool.pop()
-            assert isinstance(obj, list)
-            assert len(obj) == self._CHUNKSIZE
-            return obj
-        return self._pool_getnew()
-    
-    def _pool_reclaim(self, obj: list[Any]) -> None:
-        assert isinstance(obj, list)
-        assert len(obj) == self._CHUNKSIZE
-        for idx in range(self._CHUNKSIZE):
-            obj[idx] = None
-        if self._pool is None:
-            self._pool = [obj]
-        else:
-            self._pool.append(obj)
-
-    def _pool_getnew(self) -> list[Any]:
-        return [None] * self._CHUNKSIZE
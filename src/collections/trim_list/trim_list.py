@@ -52,6 +52,9 @@ class TrimList(Generic[_T]):
         cur_len = len(self._data)
         return range(start, start + cur_len)
 
+    def get(self, idx: int) -> _T:
+        return self._data[idx - self._pop_count]
+
     def __getitem__(self, _slice: Union[int, slice, range, Iterable[int]]) -> Union[_T, TrimListWrapper[_T]]:
         ###
         ### TODO Incomplete implementation of sliceable.
@@ -79,9 +82,8 @@ class TrimList(Generic[_T]):
         cur_len = len(self._data)
         target_len = max(0, cur_len + self._pop_count - idx)
         trim_count = max(0, cur_len - target_len)
-        trimmed_values: list[_T] = []
-        for _ in range(trim_count):
-            trimmed_values.append(self._data.popleft())
+        popleft = self._data.popleft
+        trimmed_values: list[_T] = [popleft() for _ in range(trim_count)]
         self._pop_count += trim_count
         return trimmed_values
 